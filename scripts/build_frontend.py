@@ -4,43 +4,78 @@
 Build frontend and copy to Python package static files directory
 """
 
+import argparse
+import hashlib
+import os
 import shutil
+import stat
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Number of threads used to copy and delete frontend files
+COPY_WORKERS = 16
+
+# Hash of the frontend sources at the last successful build
+BUILD_HASH_FILE = Path(".cache/frontend_build.hash")
+
+# Frontend directories that are installed or generated rather than source, along
+# with every top-level dot-directory (e.g. webpack's .webpack-cache)
+SOURCE_EXCLUDES = {"node_modules", "dist"}
+
 # Set console encoding
 if sys.platform == "win32":
-    import codecs
-    sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
-    sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
+    os.environ.setdefault("PYTHONUTF8", "1")
+    for stream in (sys.stdout, sys.stderr):
+        if stream.encoding.lower() not in ("utf-8", "utf8"):
+            stream.reconfigure(encoding="utf-8", errors="replace")
 
 def run_command(command, description, cwd=None):
-    """Run command and check result"""
-    print(f"🔄 {description}...")
+    """Run command (an argument list) with live output and check result"""
+    print(f"🔄 {description}...", flush=True)
+    # Resolve the executable ourselves since no shell is involved (npm is npm.cmd on Windows)
+    command = [shutil.which(command[0]) or command[0], *command[1:]]
     try:
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            cwd=cwd, 
-            capture_output=True, 
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
+        result = subprocess.run(command, cwd=cwd, check=False)
     except Exception as e:
         print(f"❌ {description} failed: {e}")
         return False
     
     if result.returncode != 0:
-        print(f"❌ {description} failed:")
-        if result.stderr:
-            print(result.stderr)
+        print(f"❌ {description} failed with exit code {result.returncode}")
         return False
     
     print(f"✅ {description} succeeded")
     return True
 
+def dependencies_hash(frontend_dir):
+    """Hash the frontend dependency manifest and lockfile"""
+    digest = hashlib.blake2b()
+    for name in ("package.json", "package-lock.json"):
+        manifest = frontend_dir / name
+        if manifest.exists():
+            digest.update(manifest.read_bytes())
+    return digest.hexdigest()
+
+def sources_hash(frontend_dir):
+    """Hash the path, size and mtime of every frontend source file"""
+    digest = hashlib.blake2b()
+    directories = [(str(frontend_dir), "")]
+    for directory, prefix in directories:
+        with os.scandir(directory) as entries:
+            # Sort so the digest does not depend on directory listing order
+            for entry in sorted(entries, key=lambda entry: entry.name):
+                relative_path = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    if not prefix and (entry.name in SOURCE_EXCLUDES or entry.name.startswith(".")):
+                        continue
+                    directories.append((entry.path, f"{relative_path}/"))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    digest.update(f"{relative_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
 def build_frontend():
     """Build frontend project"""
     frontend_dir = Path("frontend")
@@ -49,18 +84,59 @@ def build_frontend():
         print("❌ frontend directory does not exist")
         return False
     
-    # Check if node_modules exists
-    if not (frontend_dir / "node_modules").exists():
+    # Only install dependencies when the manifest changed since the last install
+    hash_file = frontend_dir / "node_modules" / ".install-hash"
+    installed_hash = hash_file.read_text().strip() if hash_file.exists() else None
+    if installed_hash != dependencies_hash(frontend_dir):
         print("📦 Installing frontend dependencies...")
-        if not run_command("npm install", "Install frontend dependencies", cwd=frontend_dir):
+        if (frontend_dir / "package-lock.json").exists():
+            install_command = ["npm", "ci", "--prefer-offline", "--no-audit", "--no-fund"]
+        else:
+            install_command = ["npm", "install", "--no-audit", "--no-fund"]
+        if not run_command(install_command, "Install frontend dependencies", cwd=frontend_dir):
             return False
+        # npm install may have just created the lockfile, so hash after installing
+        hash_file.write_text(dependencies_hash(frontend_dir))
+    else:
+        print("📦 Frontend dependencies are up to date")
     
     # Build frontend
-    if not run_command("npm run build", "Build frontend", cwd=frontend_dir):
+    if not run_command(["npm", "run", "build"], "Build frontend", cwd=frontend_dir):
         return False
     
     return True
 
+def _remove_writable(remove, path):
+    """Call remove(path), clearing the read-only attribute that blocks deletion on Windows if needed"""
+    try:
+        remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)
+        remove(path)
+
+def remove_tree(path):
+    """Remove a directory tree, deleting files in parallel on Windows"""
+    if sys.platform != "win32":
+        shutil.rmtree(path)
+        return
+    
+    # DeleteFileW is the bottleneck on Windows, so unlink files concurrently
+    # and remove the (then empty) directories bottom-up afterwards
+    files = []
+    directories = [str(path)]
+    for directory in directories:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                else:
+                    files.append(entry.path)
+    
+    with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+        list(executor.map(lambda file: _remove_writable(os.unlink, file), files))
+    for directory in reversed(directories):
+        _remove_writable(os.rmdir, directory)
+
 def copy_frontend_dist():
     """Copy frontend build files to Python package directory"""
     frontend_dist = Path("frontend/dist")
@@ -70,46 +146,77 @@ def copy_frontend_dist():
         print("❌ frontend/dist directory does not exist, please build frontend first")
         return False
     
-    # Clean and create static files directory
-    if static_dir.exists():
-        shutil.rmtree(static_dir)
-        print("🗑️  Cleaned old static files")
-    
-    static_dir.mkdir(parents=True, exist_ok=True)
+    # Copy into a sibling directory first and swap it in afterwards, so the
+    # package always has a complete set of static files
+    new_dir = static_dir.with_suffix(".new")
+    old_dir = static_dir.with_suffix(".old")
     
-    # Copy all frontend files
     try:
-        for item in frontend_dist.iterdir():
-            if item.is_file():
-                shutil.copy2(item, static_dir)
-                print(f"📄 Copied file: {item.name}")
-            elif item.is_dir():
-                shutil.copytree(item, static_dir / item.name)
-                print(f"📁 Copied directory: {item.name}")
+        for leftover in (new_dir, old_dir):
+            if leftover.exists():
+                remove_tree(leftover)
+        
+        # Copy all frontend files in parallel, the copy is bound by per-file syscalls
+        files = [item for item in frontend_dist.rglob("*") if item.is_file()]
+        directories = {new_dir / item.parent.relative_to(frontend_dist) for item in files}
+        new_dir.mkdir(parents=True)
+        for directory in directories:
+            directory.mkdir(parents=True, exist_ok=True)
         
-        print(f"✅ Frontend files copied to {static_dir}")
+        def copy_file(item):
+            shutil.copy2(item, new_dir / item.relative_to(frontend_dist))
+        
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            # Consume the results so that copy errors are raised here
+            list(executor.map(copy_file, files))
+        
+        # Swap the directories, then delete the old static files
+        if static_dir.exists():
+            os.replace(static_dir, old_dir)
+        os.replace(new_dir, static_dir)
+        if old_dir.exists():
+            remove_tree(old_dir)
+            print("🗑️  Cleaned old static files")
+        
+        print(f"✅ Copied {len(files)} files ({len(directories)} directories) to {static_dir}")
         return True
         
     except Exception as e:
         print(f"❌ Failed to copy frontend files: {e}")
         return False
 
-def list_static_files():
-    """List static files"""
+def list_static_files(verbose=False):
+    """List static files (only totals unless verbose)"""
     static_dir = Path("src/graphxr_database_proxy/static")
     
     if not static_dir.exists():
         print("❌ Static files directory does not exist")
         return
     
-    print("\n📁 Static files list:")
-    for item in static_dir.rglob("*"):
-        if item.is_file():
-            size = item.stat().st_size / 1024  # KB
-            relative_path = item.relative_to(static_dir)
-            print(f"   📄 {relative_path} ({size:.1f} KB)")
+    # Walk with os.scandir, whose entries carry the file type (and stat on Windows)
+    files = []
+    directories = [(str(static_dir), "")]
+    for directory, prefix in directories:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                relative_path = f"{prefix}{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append((entry.path, f"{relative_path}/"))
+                elif entry.is_file():
+                    files.append((relative_path, entry.stat().st_size))
+    
+    total_size = sum(size for _, size in files) / (1024 * 1024)  # MB
+    lines = [f"\n📁 Static files: {len(files)} files, {total_size:.1f} MB"]
+    if verbose:
+        lines.extend(f"   📄 {path} ({size / 1024:.1f} KB)" for path, size in files)
+    # Single write, console output is slow on Windows
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
+    parser = argparse.ArgumentParser(description="Build frontend and copy it to the Python package")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every static file")
+    args = parser.parse_args()
+    
     print("🏗️ GraphXR Database Proxy Frontend Build Tool")
     print("=" * 50)
     
@@ -118,18 +225,30 @@ def main():
         print("❌ Please run this script from the project root directory")
         sys.exit(1)
     
-    # Build frontend
-    if not build_frontend():
-        print("❌ Frontend build failed")
-        sys.exit(1)
-    
-    # Copy frontend files
-    if not copy_frontend_dist():
-        print("❌ Failed to copy frontend files")
-        sys.exit(1)
+    # Skip the build when the sources are unchanged since the last successful one
+    frontend_dir = Path("frontend")
+    source_hash = sources_hash(frontend_dir) if frontend_dir.exists() else None
+    built_hash = BUILD_HASH_FILE.read_text().strip() if BUILD_HASH_FILE.exists() else None
+    if source_hash and source_hash == built_hash and Path("src/graphxr_database_proxy/static").exists():
+        print("🟰 Frontend unchanged, skipping build")
+    else:
+        # Build frontend
+        BUILD_HASH_FILE.unlink(missing_ok=True)
+        if not build_frontend():
+            print("❌ Frontend build failed")
+            sys.exit(1)
+        
+        # Copy frontend files
+        if not copy_frontend_dist():
+            print("❌ Failed to copy frontend files")
+            sys.exit(1)
+        
+        # Hash again, npm install may have created or updated package-lock.json
+        BUILD_HASH_FILE.parent.mkdir(exist_ok=True)
+        BUILD_HASH_FILE.write_text(sources_hash(frontend_dir))
     
     # List static files
-    list_static_files()
+    list_static_files(verbose=args.verbose)
     
     print("\n✨ Frontend build and copy completed!")
     print("💡 Now you can run 'python scripts/publish.py build' to build the package")
@@ -8,69 +8,79 @@ Usage:
     python scripts/publish.py prod    # Publish to PyPI
     python scripts/publish.py build   # Build and validate only
     python scripts/publish.py         # Interactive selection
+    python scripts/publish.py prod -y # Answer yes to all prompts (e.g. in CI)
 """
 
 import subprocess
 import sys
 import os
 import argparse
+import importlib
+import runpy
+import stat
+from collections import deque
+from importlib.metadata import distribution, PackageNotFoundError
+from glob import glob
 from pathlib import Path
 
+# Child processes inherit these, so their output matches the UTF-8 decoding in run_command
+os.environ['PYTHONIOENCODING'] = 'utf-8'
+os.environ['PYTHONUTF8'] = '1'
+
 # Windows encoding fix
 if sys.platform == "win32":
-    import codecs
-    import locale
-    
-    # Set environment variables to fix rich/twine encoding issues
-    os.environ['PYTHONIOENCODING'] = 'utf-8'
-    os.environ['PYTHONUTF8'] = '1'
-    
-    # Fix console output encoding
-    try:
-        sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
-        sys.stderr = codecs.getwriter("utf-8")(sys.stderr.detach())
-    except:
-        pass
+    # Fix console output encoding, unless the streams are already UTF-8
+    for stream in (sys.stdout, sys.stderr):
+        if (getattr(stream, "encoding", None) or "").lower() not in ("utf-8", "utf8"):
+            try:
+                stream.reconfigure(encoding="utf-8", errors="replace")
+            except (AttributeError, ValueError):
+                pass
 
-def get_python_executable():
-    """Get the path of the current Python interpreter"""
-    return sys.executable
+# Current Python interpreter, used to run pip and build
+PY = sys.executable
+
+# Number of output lines repeated when a command fails
+ERROR_TAIL_LINES = 20
 
 def run_command(command, description):
-    """Run command and check result"""
-    print(f"🔄 {description}...")
-    
-    # If command contains python, replace with current Python interpreter
-    if command.startswith("python "):
-        command = command.replace("python ", f"{get_python_executable()} ", 1)
-    elif command == "python -m build":
-        command = f"{get_python_executable()} -m build"
+    """Run command (an argument list), streaming its output line by line, and check result"""
+    print(f"🔄 {description}...", flush=True)
     
+    # Keep only the last lines for the error message instead of buffering everything
+    tail = deque(maxlen=ERROR_TAIL_LINES)
     try:
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            capture_output=True, 
-            text=True, 
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True,
             encoding='utf-8',
-            errors='ignore'
-        )
+            errors='replace'
+        ) as process:
+            for line in process.stdout:
+                sys.stdout.write(line)
+                tail.append(line)
+            returncode = process.wait()
     except Exception as e:
         print(f"❌ {description} failed: {e}")
         return False
     
-    if result.returncode != 0:
-        print(f"❌ {description} failed:")
-        if result.stderr:
-            print(result.stderr)
+    if returncode != 0:
+        print(f"❌ {description} failed with exit code {returncode}:")
+        if tail:
+            print("".join(tail).rstrip())
         return False
     
     print(f"✅ {description} succeeded")
-    if result.stdout and result.stdout.strip():
-        print(f"   Output: {result.stdout.strip()}")
     return True
 
-def check_and_install_dependencies():
+def is_interactive():
+    """Whether prompts can be answered, i.e. not running in CI and stdin is a terminal"""
+    return sys.stdin.isatty() and not os.environ.get("CI")
+
+def check_and_install_dependencies(assume_yes=False):
     """Check and install publishing dependencies"""
     print("🔍 Checking publishing dependencies...")
     
@@ -78,28 +88,36 @@ def check_and_install_dependencies():
     required_packages = ["build", "twine"]
     missing_packages = []
     
+    # Only read the installed metadata, importing twine would initialize its whole stack
     for package in required_packages:
         try:
-            __import__(package)
+            distribution(package)
             print(f"✅ {package} installed")
-        except ImportError:
+        except PackageNotFoundError:
             missing_packages.append(package)
             print(f"❌ Missing package: {package}")
     
     if missing_packages:
         print(f"\n📦 Installing missing packages: {', '.join(missing_packages)}")
-        install_command = f"pip install {' '.join(missing_packages)}"
+        install_command = [PY, "-m", "pip", "install", *missing_packages]
         
-        # Ask for automatic installation
-        auto_install = input("🤔 Install missing packages automatically? (y/n): ").lower().strip()
+        # Ask for automatic installation, install without asking under --yes or CI
+        if assume_yes or os.environ.get("CI"):
+            auto_install = "yes"
+        elif is_interactive():
+            auto_install = input("🤔 Install missing packages automatically? (y/n): ").lower().strip()
+        else:
+            auto_install = "no"
         if auto_install in ['y', 'yes']:
             if not run_command(install_command, f"Install {', '.join(missing_packages)}"):
                 print("❌ Dependency installation failed, please install manually:")
-                print(f"   {install_command}")
+                print(f"   pip install {' '.join(missing_packages)}")
                 return False
+            # twine is imported in-process later, make the new install visible
+            importlib.invalidate_caches()
         else:
             print("❌ Please install missing packages manually:")
-            print(f"   {install_command}")
+            print(f"   pip install {' '.join(missing_packages)}")
             return False
     
     print("✅ All dependency checks passed")
@@ -114,12 +132,14 @@ def check_requirements():
         print("❌ Please run this script from the project root directory")
         return False
     
-    # Check required files
-    required_files = ["README.md", "LICENSE", "pyproject.toml"]
-    for file in required_files:
-        if not Path(file).exists():
-            print(f"❌ Missing file: {file}")
-            return False
+    # Check required files with a single directory listing
+    required_files = {"README.md", "LICENSE", "pyproject.toml"}
+    with os.scandir(".") as entries:
+        present = {entry.name for entry in entries if entry.is_file(follow_symlinks=False)}
+    missing_files = required_files - present
+    if missing_files:
+        print(f"❌ Missing files: {', '.join(sorted(missing_files))}")
+        return False
     
     print("✅ All requirement checks passed")
     return True
@@ -127,28 +147,55 @@ def check_requirements():
 def get_version():
     """Get version number from pyproject.toml"""
     try:
-        with open("pyproject.toml", "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip().startswith("version ="):
-                    version = line.split("=")[1].strip().strip('"')
-                    return version
+        import tomllib
+    except ImportError:
+        # Python < 3.11, tomli is installed alongside build
+        import tomli as tomllib
+    
+    try:
+        with open("pyproject.toml", "rb") as f:
+            data = tomllib.load(f)
+        return data["project"]["version"]
     except Exception as e:
         print(f"❌ Unable to read version number: {e}")
         return None
 
+def _remove_writable(remove, path):
+    """Call remove(path), clearing the read-only attribute that blocks deletion on Windows if needed"""
+    try:
+        remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)
+        remove(path)
+
+def _fast_rmtree(path):
+    """Remove a directory tree using the file types cached on os.scandir entries"""
+    with os.scandir(path) as entries:
+        # Deleting in inode order keeps the filesystem's disk access sequential
+        entries = sorted(entries, key=lambda entry: entry.inode())
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            _fast_rmtree(entry.path)
+        else:
+            _remove_writable(os.unlink, entry.path)
+    _remove_writable(os.rmdir, path)
+
 def clean_build():
     """Clean build files"""
-    import shutil
-    
     dirs_to_clean = ["dist", "build"]
     for dir_name in dirs_to_clean:
         if Path(dir_name).exists():
-            shutil.rmtree(dir_name)
+            _fast_rmtree(dir_name)
             print(f"🗑️  Removed directory: {dir_name}")
     
     # Clean egg-info directories
-    for egg_info in Path(".").glob("*.egg-info"):
-        shutil.rmtree(egg_info)
+    with os.scandir(".") as entries:
+        egg_infos = [
+            entry.name for entry in entries
+            if entry.name.endswith(".egg-info") and entry.is_dir(follow_symlinks=False)
+        ]
+    for egg_info in egg_infos:
+        _fast_rmtree(egg_info)
         print(f"🗑️  Removed directory: {egg_info}")
 
 def build_frontend():
@@ -158,85 +205,124 @@ def build_frontend():
     # Run frontend build script
     build_script = Path("scripts/build_frontend.py")
     if build_script.exists():
-        return run_command(f"{get_python_executable()} scripts/build_frontend.py", "Build frontend")
+        # Run the script in-process instead of starting another interpreter
+        argv = sys.argv
+        sys.argv = [str(build_script)]
+        try:
+            runpy.run_path(str(build_script), run_name="__main__")
+            return True
+        except SystemExit as e:
+            return e.code in (None, 0)
+        except Exception as e:
+            print(f"❌ Frontend build failed: {e}")
+            return False
+        finally:
+            sys.argv = argv
     else:
         print("⚠️  Frontend build script not found, skipping frontend build")
         return True
 
 def build_package():
     """Build distribution package"""
-    return run_command("python -m build", "Build distribution package")
+    return run_command([PY, "-m", "build"], "Build distribution package")
+
+def get_dist_files():
+    """Get the built files in dist/, expanded here since commands run without a shell"""
+    files = sorted(glob("dist/*"))
+    if not files:
+        print("❌ No built files found in dist/")
+    return files
 
 def check_package():
     """Check package contents"""
-    return run_command("twine check dist/*", "Validate package contents")
+    # twine runs in-process, saving an interpreter start and twine's imports per call
+    try:
+        from twine.commands.check import check as twine_check
+    except ImportError as e:
+        print(f"❌ twine is not available: {e}")
+        return False
+    
+    files = get_dist_files()
+    if not files:
+        return False
+    
+    print("🔄 Validate package contents...")
+    try:
+        # Returns True when any distribution fails the check
+        failed = twine_check(files)
+    except Exception as e:
+        print(f"❌ Validate package contents failed: {e}")
+        return False
+    
+    if failed:
+        print("❌ Validate package contents failed")
+        return False
+    
+    print("✅ Validate package contents succeeded")
+    return True
 
 def list_dist_files():
     """List built files"""
     print("\n📦 Built files:")
-    dist_path = Path("dist")
-    if dist_path.exists():
-        for file in dist_path.iterdir():
-            size = file.stat().st_size / 1024  # KB
-            print(f"   📄 {file.name} ({size:.1f} KB)")
+    if os.path.isdir("dist"):
+        with os.scandir("dist") as entries:
+            for entry in entries:
+                size = entry.stat().st_size / 1024  # KB
+                print(f"   📄 {entry.name} ({size:.1f} KB)")
 
-def upload_to_testpypi():
-    """Upload to TestPyPI"""
-    print("\n🧪 Uploading to TestPyPI...")
+def _twine_upload(repository_name):
+    """Upload the built files with twine"""
+    try:
+        from twine.commands.upload import upload as twine_upload
+        from twine.settings import Settings
+    except ImportError as e:
+        print(f"❌ twine is not available: {e}")
+        return False
     
-    # Set environment variables to avoid encoding issues
-    env = os.environ.copy()
-    env['PYTHONIOENCODING'] = 'utf-8'
-    env['PYTHONUTF8'] = '1'
+    files = get_dist_files()
+    if not files:
+        return False
     
     try:
-        result = subprocess.run(
-            f"{get_python_executable()} -m twine upload --repository testpypi dist/*",
-            shell=True,
-            env=env,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        return result.returncode == 0
+        # Build the settings through twine's own argument parser, which is where
+        # TWINE_USERNAME, TWINE_PASSWORD, TWINE_REPOSITORY_URL etc. are read
+        parser = argparse.ArgumentParser(prog="twine upload")
+        Settings.register_argparse_arguments(parser)
+        settings = Settings.from_argparse(parser.parse_args(["--repository", repository_name]))
+        twine_upload(settings, files)
+        return True
     except Exception as e:
         print(f"❌ Upload failed: {e}")
         return False
 
+def upload_to_testpypi():
+    """Upload to TestPyPI"""
+    print("\n🧪 Uploading to TestPyPI...", flush=True)
+    return _twine_upload("testpypi")
+
 def upload_to_pypi():
     """Upload to PyPI"""
-    print("\n🚀 Uploading to PyPI...")
-    
-    # Set environment variables to avoid encoding issues
-    env = os.environ.copy()
-    env['PYTHONIOENCODING'] = 'utf-8'
-    env['PYTHONUTF8'] = '1'
-    
-    try:
-        result = subprocess.run(
-            f"{get_python_executable()} -m twine upload dist/*",
-            shell=True,
-            env=env,
-            text=True,
-            encoding='utf-8',
-            errors='replace'
-        )
-        return result.returncode == 0
-    except Exception as e:
-        print(f"❌ Upload failed: {e}")
-        return False
+    print("\n🚀 Uploading to PyPI...", flush=True)
+    return _twine_upload("pypi")
 
 def main():
     parser = argparse.ArgumentParser(description="Publish GraphXR Database Proxy to PyPI")
     parser.add_argument("target", nargs="?", choices=["test", "prod", "build"], 
                        help="Publish target: test (TestPyPI), prod (PyPI), or build (build and validate only)")
+    parser.add_argument("-y", "--yes", action="store_true",
+                       help="Answer yes to all prompts (install missing packages, confirm PyPI publish)")
     args = parser.parse_args()
     
+    # Without a terminal a prompt would fail or hang, so the target must be given
+    if not args.target and not is_interactive():
+        print("❌ No publish target given, pass one of: build, test, prod")
+        sys.exit(2)
+    
     print("🚀 GraphXR Database Proxy Publishing Tool")
     print("=" * 50)
     
     # Check and install dependencies
-    if not check_and_install_dependencies():
+    if not check_and_install_dependencies(assume_yes=args.yes):
         sys.exit(1)
     
     # Check requirements
@@ -291,8 +377,9 @@ def main():
         print(f"\n✅ Package build and validation complete!")
         print(f"📦 Build files are in the dist/ directory")
         print(f"🔍 You can check the following files:")
-        for file in Path("dist").iterdir():
-            print(f"   📄 {file.name}")
+        with os.scandir("dist") as entries:
+            for entry in entries:
+                print(f"   📄 {entry.name}")
         print(f"\n💡 Next steps:")
         print(f"   - Run 'python scripts/publish.py test' to publish to TestPyPI")
         print(f"   - Run 'python scripts/publish.py prod' to publish to PyPI")
@@ -310,7 +397,13 @@ def main():
     elif target == "prod":
         print(f"\n⚠️  Preparing to publish to production PyPI (version {version})")
         print("   This will make the package available to all users!")
-        confirm = input("   Confirm publish? (yes/no): ").lower()
+        if args.yes:
+            confirm = "yes"
+        elif is_interactive():
+            confirm = input("   Confirm publish? (yes/no): ").lower()
+        else:
+            print("❌ Cannot confirm publish without a terminal, pass --yes to confirm")
+            sys.exit(1)
         
         if confirm == "yes":
             if upload_to_pypi():
@@ -5,7 +5,8 @@ Version Update Script
 Updates version numbers across all project files:
 - package.json
 - pyproject.toml
-- src/graphxr_database_proxy/__init__.py
+
+The package's __version__ is read from the installed package metadata.
 
 Usage:
     python scripts/update_version.py <new_version>
@@ -15,25 +16,51 @@ Example:
 """
 
 import sys
+import os
 import re
 import json
 from pathlib import Path
 
+# Semantic versions: a full match for validation, and the parts for incrementing
+_SEMVER_RE = re.compile(r'^\d+\.\d+\.\d+(?:-[a-zA-Z0-9.-]+)?$')
+_SEMVER_PARTS_RE = re.compile(r'^(\d+)\.(\d+)\.(\d+)(?:-(.+))?$')
+
+# pyproject.toml: the [project] table header, any table header, and its version key
+_PROJECT_TABLE_RE = re.compile(r'^\[project\]\s*$', re.MULTILINE)
+_TABLE_HEADER_RE = re.compile(r'^\[', re.MULTILINE)
+_PYPROJ_RE = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+
+# package.json: the first "version" key, which is the top-level one
+_PKG_JSON_RE = re.compile(r'("version"\s*:\s*)"([^"]+)"')
+
+
+def write_atomic(file_path: Path, content: str) -> None:
+    """Write a file through a temporary file so it is never left half-written"""
+    tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, file_path)
+
 
 def update_package_json(version: str) -> bool:
     """Update version in package.json"""
     file_path = Path("package.json")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        content = file_path.read_text(encoding='utf-8')
+        
+        # Edit the value in place to keep the file's formatting and key order
+        match = _PKG_JSON_RE.search(content)
+        if not match:
+            print("❌ Failed to update package.json: version not found")
+            return False
+        old_version = match.group(2)
         
-        old_version = data.get('version', 'unknown')
-        data['version'] = version
+        if old_version == version:
+            print(f"✅ package.json already at version {version}")
+            return True
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            f.write('\n')  # Add newline at end of file
+        new_content = f'{content[:match.start()]}{match.group(1)}"{version}"{content[match.end():]}'
+        write_atomic(file_path, new_content)
         
         print(f"✅ Updated package.json: {old_version} → {version}")
         return True
@@ -47,24 +74,32 @@ def update_pyproject_toml(version: str) -> bool:
     file_path = Path("pyproject.toml")
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_path.read_text(encoding='utf-8')
+        
+        # Only look inside the [project] table, other tables may have a version key
+        header = _PROJECT_TABLE_RE.search(content)
+        if not header:
+            print("❌ Failed to update pyproject.toml: [project] table not found")
+            return False
+        next_header = _TABLE_HEADER_RE.search(content, header.end())
+        table_end = next_header.start() if next_header else len(content)
         
         # Find current version
-        match = re.search(r'^version\s*=\s*"([^"]+)"', content, re.MULTILINE)
-        old_version = match.group(1) if match else 'unknown'
+        match = _PYPROJ_RE.search(content, header.end(), table_end)
+        if not match:
+            print("❌ Failed to update pyproject.toml: version not found in [project]")
+            return False
+        old_version = match.group(1)
+        
+        # Leave the file (and its mtime) untouched when nothing changes
+        if old_version == version:
+            print(f"✅ pyproject.toml already at version {version}")
+            return True
         
         # Replace version
-        new_content = re.sub(
-            r'^version\s*=\s*"[^"]+"',
-            f'version = "{version}"',
-            content,
-            count=1,
-            flags=re.MULTILINE
-        )
+        new_content = f'{content[:match.start()]}version = "{version}"{content[match.end():]}'
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        write_atomic(file_path, new_content)
         
         print(f"✅ Updated pyproject.toml: {old_version} → {version}")
         return True
@@ -73,35 +108,16 @@ def update_pyproject_toml(version: str) -> bool:
         return False
 
 
-def update_init_py(version: str) -> bool:
-    """Update version in src/graphxr_database_proxy/__init__.py"""
-    file_path = Path("src/graphxr_database_proxy/__init__.py")
-    
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find current version
-        match = re.search(r'^__version__\s*=\s*"([^"]+)"', content, re.MULTILINE)
-        old_version = match.group(1) if match else 'unknown'
-        
-        # Replace version
-        new_content = re.sub(
-            r'^__version__\s*=\s*"[^"]+"',
-            f'__version__ = "{version}"',
-            content,
-            count=1,
-            flags=re.MULTILINE
-        )
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
-        
-        print(f"✅ Updated __init__.py: {old_version} → {version}")
-        return True
-    except Exception as e:
-        print(f"❌ Failed to update __init__.py: {e}")
-        return False
+# Every file holding the version, updated in this order
+UPDATERS = (update_package_json, update_pyproject_toml)
+
+
+def update_all(version: str) -> bool:
+    """Update the version in every file, returning whether all updates succeeded"""
+    # Serial on purpose: each update takes microseconds, so threads would only
+    # add overhead and interleave the progress output
+    results = [update(version) for update in UPDATERS]
+    return all(results)
 
 
 def get_current_version() -> str:
@@ -117,7 +133,7 @@ def get_current_version() -> str:
 
 def increment_version(version: str) -> str:
     """Increment the patch version (last number)"""
-    match = re.match(r'^(\d+)\.(\d+)\.(\d+)(?:-(.+))?$', version)
+    match = _SEMVER_PARTS_RE.match(version)
     if not match:
         return None
     
@@ -133,8 +149,7 @@ def increment_version(version: str) -> str:
 
 def validate_version(version: str) -> bool:
     """Validate semantic version format"""
-    pattern = r'^\d+\.\d+\.\d+(?:-[a-zA-Z0-9.-]+)?$'
-    return bool(re.match(pattern, version))
+    return bool(_SEMVER_RE.match(version))
 
 
 def main():
@@ -177,15 +192,8 @@ def main():
     
     print(f"\n🔄 Updating version to {new_version}...\n")
     
-    # Update all files
-    results = [
-        update_package_json(new_version),
-        update_pyproject_toml(new_version),
-        update_init_py(new_version)
-    ]
-    
-    # Check results
-    if all(results):
+    # Update all files and check results
+    if update_all(new_version):
         print(f"\n🎉 Successfully updated all files to version {new_version}!")
         print("\nNext steps:")
         print("  1. Review the changes: git diff")
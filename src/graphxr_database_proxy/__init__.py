@@ -4,13 +4,39 @@ GraphXR Database Proxy
 A secure middleware for connecting GraphXR Frontend to various backend databases.
 """
 
-__version__ = "1.1.0"
+import importlib as _importlib
+from importlib.metadata import PackageNotFoundError as _PackageNotFoundError, version as _version
+
+# Read from the installed distribution so it always matches pyproject.toml
+try:
+    __version__ = _version("graphxr-database-proxy")
+except _PackageNotFoundError:
+    # Running from a source checkout that is not installed
+    __version__ = "0.0.0+local"
+
 __author__ = "Kineviz"
 __email__ = "info@kineviz.com"
 
-from .main import app
-from .proxy import DatabaseProxy
-from .models.project import Project, DatabaseConfig
-from .services.project_service import ProjectService
+__all__ = ["app", "DatabaseProxy", "Project", "DatabaseConfig", "ProjectService"]
+
+# Public names and the submodules defining them, imported on first access (PEP 562)
+# so that reading __version__ does not load FastAPI and the database drivers
+_LAZY_IMPORTS = {
+    "app": ".main",
+    "DatabaseProxy": ".proxy",
+    "Project": ".models.project",
+    "DatabaseConfig": ".models.project",
+    "ProjectService": ".services.project_service",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["app", "DatabaseProxy", "Project", "DatabaseConfig", "ProjectService"]
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
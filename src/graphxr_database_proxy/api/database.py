@@ -4,6 +4,9 @@ Database API endpoints
 
 from typing import Any, Dict
 from fastapi import APIRouter, HTTPException, Depends, Path
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from ..models.project import DatabaseType, QueryRequest, QueryResponse, SchemaResponse, GraphSchemaResponse, SampleDataResponse, APIInfo
 from ..services.project_service import ProjectService
 from ..drivers.factory import DriverFactory
@@ -11,6 +14,12 @@ from .auth import verify_api_key_or_admin
 
 router = APIRouter(prefix="/api", tags=["database"])
 
+
+def _error_status(error: Exception) -> int:
+    """HTTP status for a driver error, using the status code carried by Google API errors"""
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) and 400 <= code < 600 else 500
+
 def get_project_service() -> ProjectService:
     return ProjectService()
 
@@ -91,6 +100,58 @@ async def execute_query(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/{database_type}/{project_name}/queryStream")
+async def execute_query_stream(
+    database_type: DatabaseType = Path(..., description="Database type"),
+    project_name: str = Path(..., description="Project name"),
+    query_request: QueryRequest = ...,
+    service: ProjectService = Depends(get_project_service),
+    _: str | None = Depends(verify_api_key_or_admin)
+):
+    """Execute a table query and stream the rows as newline-delimited JSON"""
+    try:
+        # Find project by name
+        project = await service.get_project_by_name(project_name)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        
+        if project.database_type != database_type:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Project database type {project.database_type} does not match requested type {database_type}"
+            )
+        
+        # Create driver and stream query rows, disconnecting once the response is sent
+        driver = DriverFactory.create_driver(project)
+        await driver.connect()
+        
+        try:
+            # Executes the query up to its first row before the response starts,
+            # so that query errors get an error status instead of a truncated 200
+            rows = await run_in_threadpool(
+                driver.stream_query,
+                query_request.query,
+                query_request.parameters
+            )
+        except NotImplementedError as e:
+            await driver.disconnect()
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            await driver.disconnect()
+            raise HTTPException(status_code=_error_status(e), detail=str(e))
+        
+        return StreamingResponse(
+            rows,
+            media_type="application/x-ndjson",
+            background=BackgroundTask(driver.disconnect)
+        )
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{database_type}/{project_name}/schema", response_model=SchemaResponse)
 async def get_schema(
     database_type: DatabaseType = Path(..., description="Database type"),
@@ -3,7 +3,7 @@ Base driver interface for database connections
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from ..models.project import Project ,DatabaseConfig, QueryResponse, SchemaResponse, GraphSchemaResponse, SampleDataResponse
 
 
@@ -35,6 +35,10 @@ class BaseDatabaseDriver(ABC):
         """Execute a query"""
         pass
     
+    def stream_query(self, query: str, parameters: Dict[str, Any] = None) -> Iterator[bytes]:
+        """Execute a query (blocking) and return its rows as newline-delimited JSON, raising query errors before returning"""
+        raise NotImplementedError(f"Streaming queries are not supported for {self.config.type}")
+    
     @abstractmethod
     async def get_schema(self) -> SchemaResponse:
         """Get database schema"""
@@ -53,4 +57,13 @@ class BaseDatabaseDriver(ABC):
     @abstractmethod
     def get_api_info(self, project_name: str) -> Dict[str, Any]:
         """Get API information for this database"""
-        pass
\ No newline at end of file
+        pass
+
+    async def warm_up(self) -> None:
+        """Open the connection ahead of the first request"""
+        await self.connect()
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Release resources shared across driver instances"""
+        pass
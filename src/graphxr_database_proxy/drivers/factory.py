@@ -2,7 +2,8 @@
 Driver factory for creating database drivers
 """
 
-from typing import Dict, Type
+import asyncio
+from typing import Dict, List, Type
 from .base import BaseDatabaseDriver
 from .spanner import SpannerDriver
 from ..models.project import Project, DatabaseConfig, DatabaseType
@@ -33,4 +34,22 @@ class DriverFactory:
     @classmethod
     def get_supported_types(cls) -> list[DatabaseType]:
         """Get list of supported database types"""
-        return list(cls._drivers.keys())
\ No newline at end of file
+        return list(cls._drivers.keys())
+    
+    @classmethod
+    async def warm_up(cls, projects: List[Project]) -> None:
+        """Open connections for the given projects concurrently, ignoring failures"""
+        async def warm_up_project(project: Project) -> None:
+            try:
+                await cls.create_driver(project).warm_up()
+                print(f"[OK] Warmed up connection for project {project.name}")
+            except Exception as e:
+                print(f"[WARN] Failed to warm up connection for project {project.name}: {e}")
+        
+        await asyncio.gather(*(warm_up_project(project) for project in projects))
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Release resources held by all registered driver types"""
+        for driver_class in cls._drivers.values():
+            driver_class.shutdown()
@@ -4,12 +4,17 @@ Google Cloud Spanner driver
 """
 
 from hashlib import new
+import asyncio
+import itertools
 import os
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+import orjson
+from fastapi.concurrency import run_in_threadpool
 from google.cloud import spanner
-from google.cloud.spanner_v1 import Client, data_types
+from google.cloud.spanner_v1 import Client, PingingPool, data_types
 from google.oauth2 import service_account
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
@@ -32,6 +37,34 @@ import json
 class SpannerDriver(BaseDatabaseDriver):
     """Google Cloud Spanner driver"""
 
+    # Session pool settings. Every in-flight query (and every open /queryStream
+    # response) holds a session, so the default matches the app's THREADPOOL_SIZE.
+    # Once all sessions are in use, a query waits up to POOL_DEFAULT_TIMEOUT
+    # seconds for one to be returned and then fails.
+    POOL_SIZE = int(os.environ.get("SPANNER_POOL_SIZE", "100"))
+    POOL_DEFAULT_TIMEOUT = float(os.environ.get("SPANNER_POOL_TIMEOUT", "30"))
+    POOL_PING_INTERVAL = 300
+
+    # Drivers are created per request, so session pools live at class level and are
+    # keyed by project id: (credentials fingerprint, database, pool, pinger stop event)
+    _pools: Dict[str, Tuple[Any, Any, PingingPool, threading.Event]] = {}
+    _pools_lock = threading.Lock()
+    # Creating a pool makes BatchCreateSessions RPCs, which is done under a lock per
+    # project instead of _pools_lock so that other projects are not held up
+    _project_locks: Dict[str, threading.Lock] = {}
+
+    # Queries currently executing, keyed by (project id, query, parameters), so that
+    # identical concurrent requests share a single Spanner execution
+    _inflight: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    # Short-lived cache of query results, GraphXR re-issues the same schema and
+    # overview queries repeatedly. Set QUERY_CACHE_TTL=0 to disable.
+    QUERY_CACHE_TTL = float(os.environ.get("QUERY_CACHE_TTL", "2"))
+    QUERY_CACHE_SIZE = 256
+    # Larger results (rows, or nodes plus relationships) are not kept in the cache
+    QUERY_CACHE_MAX_ROWS = 10000
+    _query_cache: Dict[Tuple[str, str, str], Tuple[float, QueryData]] = {}
+
     def __init__(self, project: Project):
         super().__init__(project)
         self.client: Optional[Client] = None
@@ -60,9 +93,9 @@ class SpannerDriver(BaseDatabaseDriver):
             print(f"[INFO] Instance: {self.config.instance_id}")
             print(f"[INFO] Database: {self.config.database_id}")
             
-            # Get instance and database
+            # Get instance and database (reusing the pooled sessions if available)
             self.instance = self.client.instance(self.config.instance_id)
-            self.database = self.instance.database(self.config.database_id)
+            self.database = await run_in_threadpool(self._get_pooled_database)
             
             print("[OK] Spanner connection established")
             
@@ -70,12 +103,104 @@ class SpannerDriver(BaseDatabaseDriver):
             print(f"[ERROR] Failed to connect to Spanner: {str(e)}")
             raise ConnectionError(f"Failed to connect to Spanner: {str(e)}")
 
+    def _pool_fingerprint(self) -> Tuple[Any, ...]:
+        """Identify the database and credentials a pooled database was created for"""
+        oauth_info = self.config.oauth_config
+        if self.config.auth_type == AuthType.OAUTH2:
+            # Credentials with a refresh token renew themselves, so only a new grant
+            # (or a new access token when there is nothing to refresh with) counts
+            credential = (
+                (oauth_info.client_id, oauth_info.refresh_token or oauth_info.token)
+                if oauth_info else None
+            )
+        elif self.config.auth_type == AuthType.SERVICE_ACCOUNT:
+            credential = oauth_info.private_key_id if oauth_info else None
+        else:
+            credential = None
+        return (
+            self.config.auth_type,
+            self.config.project_id,
+            self.config.instance_id,
+            self.config.database_id,
+            credential,
+        )
+
+    def _get_pooled_database(self):
+        """Get the long-lived database for this project, creating its session pool on first use"""
+        fingerprint = self._pool_fingerprint()
+        cls = type(self)
+        with cls._pools_lock:
+            entry = cls._pools.get(self.project.id)
+            if entry and entry[0] == fingerprint:
+                return entry[1]
+            project_lock = cls._project_locks.setdefault(self.project.id, threading.Lock())
+
+        with project_lock:
+            # Another request may have created the pool while this one waited
+            with cls._pools_lock:
+                entry = cls._pools.get(self.project.id)
+            if entry and entry[0] == fingerprint:
+                return entry[1]
+
+            pool = PingingPool(
+                size=cls.POOL_SIZE,
+                default_timeout=cls.POOL_DEFAULT_TIMEOUT,
+                ping_interval=cls.POOL_PING_INTERVAL,
+            )
+            database = self.instance.database(self.config.database_id, pool=pool)
+
+            stop_event = threading.Event()
+            threading.Thread(
+                target=cls._ping_pool,
+                args=(pool, stop_event),
+                name=f"spanner-ping-{self.project.id}",
+                daemon=True,
+            ).start()
+
+            with cls._pools_lock:
+                cls._pools[self.project.id] = (fingerprint, database, pool, stop_event)
+            print(f"[INFO] Created Spanner session pool for project {self.project.id}")
+
+        if entry:
+            # Configuration or credentials changed, retire the old pool. Deleting its
+            # sessions makes RPCs, so this happens outside the lock.
+            cls._close_pool(entry)
+        return database
+
+    @classmethod
+    def _ping_pool(cls, pool: PingingPool, stop_event: threading.Event) -> None:
+        """Keep pooled sessions alive until the pool is closed"""
+        while not stop_event.wait(cls.POOL_PING_INTERVAL):
+            try:
+                pool.ping()
+            except Exception as e:
+                print(f"[WARN] Failed to ping Spanner session pool: {e}")
+
+    @staticmethod
+    def _close_pool(entry: Tuple[Any, Any, PingingPool, threading.Event]) -> None:
+        """Stop the pinger and release the sessions of a pooled database"""
+        _, _, pool, stop_event = entry
+        stop_event.set()
+        try:
+            pool.clear()
+        except Exception as e:
+            print(f"[WARN] Failed to clear Spanner session pool: {e}")
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Close all session pools"""
+        with cls._pools_lock:
+            entries = list(cls._pools.values())
+            cls._pools.clear()
+        for entry in entries:
+            cls._close_pool(entry)
+
     async def _refresh_oauth_token(self, credentials: google.oauth2.credentials.Credentials) -> google.oauth2.credentials.Credentials:
         """Refresh OAuth token"""
         try:
             print("[INFO] Refreshing OAuth token...")
             request = Request()
-            credentials.refresh(request)
+            await run_in_threadpool(credentials.refresh, request)
             
             # Update the project with new token information
             current_time = time.time()
@@ -190,7 +315,7 @@ class SpannerDriver(BaseDatabaseDriver):
         elif needs_refresh and not oauth_info.refresh_token:
             print("[WARN] Token expires soon but no refresh token available")
 
-        return spanner.Client(project=self.config.project_id, credentials=credentials)
+        return await run_in_threadpool(spanner.Client, project=self.config.project_id, credentials=credentials)
     
     async def _get_service_account_client(self) -> Client:
         """Get Spanner client using service account"""
@@ -224,26 +349,33 @@ class SpannerDriver(BaseDatabaseDriver):
         else:
             raise ValueError("Service account information is incomplete in oauth_config")
         
-        return spanner.Client(project=self.config.project_id, credentials=credentials)
+        return await run_in_threadpool(spanner.Client, project=self.config.project_id, credentials=credentials)
     
     async def _get_adc_client(self) -> Client:
         """Get Spanner client using Application Default Credentials (ADC)"""
-        # Use default ADC credentials
-        credentials, project_id = google.auth.default(
+        # Use default ADC credentials (discovery may read files and query the metadata server)
+        credentials, project_id = await run_in_threadpool(
+            google.auth.default,
             scopes=[
                 "https://www.googleapis.com/auth/spanner.admin", 
                 "https://www.googleapis.com/auth/spanner.data"
             ]
         )
-        return spanner.Client(project=self.config.project_id, credentials=credentials)
+        return await run_in_threadpool(spanner.Client, project=self.config.project_id, credentials=credentials)
 
     async def disconnect(self) -> None:
         """Close connection to Spanner"""
-        # Spanner client doesn't need explicit disconnection
+        # Spanner client doesn't need explicit disconnection, and the session pool
+        # is kept alive for the next request (see shutdown)
         self.client = None
         self.instance = None
         self.database = None
     
+    async def warm_up(self) -> None:
+        """Create the session pool and open the gRPC channel ahead of the first request"""
+        await self.connect()
+        await run_in_threadpool(self._execute_sql_query, "SELECT 1")
+
     async def test_connection(self) -> bool:
         """Test Spanner connection"""
         try:
@@ -251,14 +383,12 @@ class SpannerDriver(BaseDatabaseDriver):
                 await self.connect()
             
             # Test database existence first
-            if not self.database.exists():
+            if not await run_in_threadpool(self.database.exists):
                 print(f"Database {self.config.database_id} does not exist")
                 return False
             
             # Simple test query using snapshot for read-only operation
-            with self.database.snapshot() as snapshot:
-                results = snapshot.execute_sql("SELECT 1 as test_value")
-                list(results)  # Consume results
+            await run_in_threadpool(self._execute_sql_query, "SELECT 1 as test_value")
             return True
         except Exception as e:
             print(f"Connection test failed: {e}")
@@ -310,10 +440,10 @@ class SpannerDriver(BaseDatabaseDriver):
                     """
 
                  # Property Graph query
-                results = self._execute_graph_query(query, parameters)
+                results = await self._run_coalesced(self._execute_graph_query, query, parameters)
             else:
                 # SQL query
-                results = self._execute_sql_query(query, parameters)
+                results = await self._run_coalesced(self._execute_sql_query, query, parameters)
             
             execution_time = time.time() - start_time
             
@@ -331,9 +461,63 @@ class SpannerDriver(BaseDatabaseDriver):
                 execution_time=execution_time
             )
     
-    def _execute_graph_query(self, query: str, parameters: Dict[str, Any] = None) -> QueryData:
-        """Execute a Property Graph query"""
-        with self.database.snapshot() as snapshot:
+    async def _run_coalesced(self, execute, query: str, parameters: Dict[str, Any] = None) -> QueryData:
+        """Run a read query in the threadpool, reusing a recent result or joining an identical query already in flight"""
+        cls = type(self)
+        key = (self.project.id, query, json.dumps(parameters or {}, sort_keys=True, default=str))
+        cached = cls._query_cache.get(key)
+        if cached:
+            if cached[0] > time.monotonic():
+                return cached[1]
+            # Drop expired results right away instead of holding them until eviction
+            cls._query_cache.pop(key, None)
+
+        task = cls._inflight.get(key)
+        if task is None:
+            # Pass the database along, the shared execution may outlive this request
+            # and its driver, whose disconnect() clears self.database
+            task = asyncio.ensure_future(
+                run_in_threadpool(execute, query, parameters, database=self.database)
+            )
+            cls._inflight[key] = task
+            task.add_done_callback(lambda done: cls._finish_query(key, done))
+        # Shield the shared execution from the cancellation of any single request
+        return await asyncio.shield(task)
+
+    @classmethod
+    def _finish_query(cls, key: Tuple[str, str, str], task: asyncio.Future) -> None:
+        """Remove a finished query from the in-flight queries and cache its result"""
+        cls._inflight.pop(key, None)
+        if cls.QUERY_CACHE_TTL <= 0 or task.cancelled() or task.exception() is not None:
+            return
+
+        result = task.result()
+        if cls._result_size(result) > cls.QUERY_CACHE_MAX_ROWS:
+            return
+
+        # Sweep expired entries, entries are in insertion order so they expire in order
+        now = time.monotonic()
+        cls._query_cache.pop(key, None)
+        while cls._query_cache:
+            oldest = next(iter(cls._query_cache))
+            if cls._query_cache[oldest][0] > now:
+                break
+            del cls._query_cache[oldest]
+        if len(cls._query_cache) >= cls.QUERY_CACHE_SIZE:
+            # Evict the oldest entry
+            cls._query_cache.pop(next(iter(cls._query_cache)))
+        cls._query_cache[key] = (now + cls.QUERY_CACHE_TTL, result)
+
+    @staticmethod
+    def _result_size(result: QueryData) -> int:
+        """Number of rows, or nodes and relationships, in a query result"""
+        if isinstance(result.data, GraphData):
+            return len(result.data.nodes) + len(result.data.relationships)
+        return len(result.data or [])
+
+    def _execute_graph_query(self, query: str, parameters: Dict[str, Any] = None, database=None) -> QueryData:
+        """Execute a Property Graph query (on the given database, or this driver's)"""
+        with (database or self.database).snapshot() as snapshot:
             results = snapshot.execute_sql(query, params=parameters or {})
             
             # Parse graph data similar to the Node.js implementation
@@ -412,25 +596,50 @@ class SpannerDriver(BaseDatabaseDriver):
                 )
             )
 
-    def _execute_sql_query(self, query: str, parameters: Dict[str, Any] = None) -> QueryData:
-        """Execute a SQL query"""
-        with self.database.snapshot() as snapshot:
+    def _execute_sql_query(self, query: str, parameters: Dict[str, Any] = None, database=None) -> QueryData:
+        """Execute a SQL query (on the given database, or this driver's)"""
+        with (database or self.database).snapshot() as snapshot:
             results = snapshot.execute_sql(query, params=parameters or {})
             rows = []
+            field_names = None
             for row in results:
-                row_dict = {}
-                for i, field in enumerate(results.fields):
-                    val = row[i]
-                    # Convert Array to string
-                    if isinstance(val, list):
-                        val = ", ".join(str(item) for item in val)
-                    row_dict[field.name] = val
-                rows.append(row_dict)
+                if field_names is None:
+                    # Fields are only known once the first result set is streamed
+                    field_names = [field.name for field in results.fields]
+                rows.append(self._row_to_dict(field_names, row))
             return QueryData(
                 type="TABLE",
                 data=rows
             )
 
+    def stream_query(self, query: str, parameters: Dict[str, Any] = None) -> Iterator[bytes]:
+        """Execute a SQL query and return an iterator over its rows as lines of JSON"""
+        rows = self._iter_query_rows(query.strip().rstrip(';'), parameters)
+        # Run the query up to its first row now, so that query errors are raised to
+        # the caller instead of in the middle of the streamed response
+        first_row = next(rows, None)
+        if first_row is None:
+            return iter(())
+        return itertools.chain((first_row,), rows)
+
+    def _iter_query_rows(self, query: str, parameters: Dict[str, Any] = None) -> Iterator[bytes]:
+        """Execute a SQL query and yield each row as a line of JSON"""
+        with self.database.snapshot() as snapshot:
+            results = snapshot.execute_sql(query, params=parameters or {})
+            field_names = None
+            for row in results:
+                if field_names is None:
+                    field_names = [field.name for field in results.fields]
+                yield orjson.dumps(self._row_to_dict(field_names, row), default=str) + b"\n"
+
+    @staticmethod
+    def _row_to_dict(field_names: List[str], row: List[Any]) -> Dict[str, Any]:
+        """Convert a result row to a record, joining Array values into strings"""
+        return {
+            name: ", ".join(str(item) for item in val) if isinstance(val, list) else val
+            for name, val in zip(field_names, row)
+        }
+
     def _is_schema_less(self, meta_json) -> bool:
         """Check if the graph schema is schema-less (has dynamic properties)"""
         if not meta_json or (not meta_json.get("nodeTables") and not meta_json.get("edgeTables")):
@@ -650,7 +859,7 @@ class SpannerDriver(BaseDatabaseDriver):
                 INFORMATION_SCHEMA.PROPERTY_GRAPHS as PG
                 WHERE PG.PROPERTY_GRAPH_NAME = "{self.config.graph_name}"
             """
-            schema_results = self._execute_sql_query(graph_schema_query)
+            schema_results = await run_in_threadpool(self._execute_sql_query, graph_schema_query)
             meta = {
                 "categories": {},
                 "relationships": {}
@@ -743,7 +952,7 @@ class SpannerDriver(BaseDatabaseDriver):
                     categories={name: Category(**cat_data) for name, cat_data in meta["categories"].items()},
                     relationships={name: Relationship(**rel_data) for name, rel_data in meta["relationships"].items()}
                 )
-                meta = self._getSchemaForSchemaLessGraphs(schema_map)
+                meta = await run_in_threadpool(self._getSchemaForSchemaLessGraphs, schema_map)
                 return GraphSchemaResponse(
                     success=True,
                     data=meta,
@@ -780,7 +989,7 @@ class SpannerDriver(BaseDatabaseDriver):
                     table_schema NOT IN ('INFORMATION_SCHEMA', 'SPANNER_SYS')
             """
             
-            results = self._execute_sql_query(schema_query)
+            results = await run_in_threadpool(self._execute_sql_query, schema_query)
 
             schema = {}
             for row in results.data:
@@ -818,7 +1027,7 @@ class SpannerDriver(BaseDatabaseDriver):
                 table_type = 'BASE TABLE'
             """
             
-            table_results = self._execute_sql_query(tables_query)
+            table_results = await run_in_threadpool(self._execute_sql_query, tables_query)
 
             def get_table_sample(table_name: str):
                 """Get sample data for a single table"""
@@ -836,7 +1045,7 @@ class SpannerDriver(BaseDatabaseDriver):
 
             # Execute queries for each table
             for table_name in table_names:
-                table_name, sample_rows = get_table_sample(table_name)
+                table_name, sample_rows = await run_in_threadpool(get_table_sample, table_name)
                 sample_data[table_name] = sample_rows
             
             return SampleDataResponse(success=True, data=sample_data)
@@ -852,6 +1061,7 @@ class SpannerDriver(BaseDatabaseDriver):
             "api_urls": {
                 "info": base_url,
                 "query": f"{base_url}/query",
+                "queryStream": f"{base_url}/queryStream",
                 "schema": f"{base_url}/schema",
                 "graphSchema": f"{base_url}/graphSchema",
                 "sampleData": f"{base_url}/sampleData",
@@ -23,6 +23,8 @@ def setup_encoding():
     os.environ["SPANNER_ENABLE_EXTENDED_TRACING"] = "false"
     os.environ["SPANNER_ENABLE_METRICS"] = "false"
     os.environ["GOOGLE_CLOUD_DISABLE_METRICS"] = "true"
+    # The server never forks after gRPC starts, skip gRPC's fork-safety handling
+    os.environ["GRPC_ENABLE_FORK_SUPPORT"] = "0"
     
     # Windows-specific handling
     if sys.platform == "win32":
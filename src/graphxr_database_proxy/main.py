@@ -19,19 +19,56 @@ os.environ["SPANNER_ENABLE_BUILT_IN_METRICS"] = "false"
 os.environ["SPANNER_ENABLE_EXTENDED_TRACING"] = "false" 
 os.environ["SPANNER_ENABLE_METRICS"] = "false"
 os.environ["GOOGLE_CLOUD_DISABLE_METRICS"] = "true"
+# The server never forks after gRPC starts, skip gRPC's fork-safety handling
+os.environ["GRPC_ENABLE_FORK_SUPPORT"] = "0"
 
+import asyncio
+import anyio.to_thread
 import uvicorn
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 
 from .api.projects import router as projects_router
 from .api.database import router as database_router
 from .api.google import router as google_router
 from .api.settings import router as settings_router
 from .api.admin import router as admin_router
+from .drivers.factory import DriverFactory
+from .services.project_service import ProjectService
+
+# Worker threads available for blocking database calls
+THREADPOOL_SIZE = 100
+
+# Seconds to wait for database connections to warm up before serving requests
+WARM_UP_TIMEOUT = 30
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown"""
+    # Database drivers run their blocking RPCs in the threadpool, allow more of
+    # them to be in flight than anyio's default of 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    
+    # Create session pools and open gRPC channels (TLS handshake) now rather
+    # than on the first query of each project
+    try:
+        projects = await ProjectService().list_projects()
+        await asyncio.wait_for(DriverFactory.warm_up(projects), timeout=WARM_UP_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"[WARN] Database warm-up did not finish within {WARM_UP_TIMEOUT}s, continuing startup")
+    except Exception as e:
+        print(f"[WARN] Database warm-up failed: {e}")
+    
+    yield
+    # Stop session pool pingers and release pooled database sessions
+    DriverFactory.shutdown()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -39,7 +76,9 @@ app = FastAPI(
     description="Secure middleware for connecting GraphXR to databases",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -51,6 +90,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses, query results are mostly repeated JSON keys.
+# Level 1 keeps the CPU cost low while still shrinking JSON several times.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
 # Include API routers
 app.include_router(admin_router)  # Admin auth (login/logout/status)
 app.include_router(projects_router)
@@ -107,6 +150,7 @@ def main():
     parser.add_argument("--port", type=int, default=9080, help="Port to bind to")
     parser.add_argument("--ui", action="store_true", help="Enable UI mode")
     parser.add_argument("--dev", action="store_true", help="Development mode with hot reload")
+    parser.add_argument("--access-log", action="store_true", help="Log every request")
     
     args = parser.parse_args()
     
@@ -123,7 +167,8 @@ def main():
         host=args.host,
         port=args.port,
         reload=args.dev,
-        log_level="info" if not args.dev else "debug"
+        log_level="info" if not args.dev else "debug",
+        access_log=args.access_log or args.dev
     )
 
 
@@ -490,7 +490,8 @@ class DatabaseProxy:
         host: str = "0.0.0.0",
         port: int = 9080,
         dev: bool = False,
-        show_apis: bool = True
+        show_apis: bool = True,
+        access_log: bool = False
     ) -> None:
         """
         Start the GraphXR Database Proxy server
@@ -498,6 +499,7 @@ class DatabaseProxy:
             host: Host to bind to (default: "0.0.0.0")
             port: Port to bind to (default: 9080)
             show_apis: Show API endpoints information (default: True)
+            access_log: Log every request (default: False, always on in dev mode)
         """
         print("\n[START] Starting GraphXR Database Proxy...")
         print(f"   Web UI: http://{host if host != '0.0.0.0' else 'localhost'}:{port}")
@@ -526,7 +528,8 @@ class DatabaseProxy:
                 host=host,
                 port=port,
                 reload=dev,
-                log_level="info" if not dev else "debug"
+                log_level="info" if not dev else "debug",
+                access_log=access_log or dev
             )
         except KeyboardInterrupt:
             print("\n[STOP] Stopping GraphXR Database Proxy...")